@@ -1,5 +1,13 @@
 import os
+import asyncio
+import json
 import logging
+import multiprocessing
+import queue
+import signal
+import sqlite3
+import threading
+import time
 from datetime import datetime
 from urllib.parse import urlparse
 import uuid # For generating unique IDs
@@ -7,7 +15,7 @@ import uuid # For generating unique IDs
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters,
-    ConversationHandler
+    ConversationHandler, BasePersistence, PersistenceInput, TypeHandler
 )
 
 # --- 1. Configure Logging ---
@@ -25,12 +33,25 @@ ADMIN_MASTER_PASSWORD = os.getenv("ADMIN_MASTER_PASSWORD", "ADMIN47")
 EDIT_LINK_PASSWORD = os.getenv("EDIT_LINK_PASSWORD", "ADMIN9292")
 DELETE_LINK_PASSWORD = os.getenv("DELETE_LINK_PASSWORD", "ADMIN4420")
 
+# Conversation state and user_data survive restarts in this SQLite file.
+# The flush interval (seconds) controls how often pending changes are written out.
+PERSISTENCE_FILE = os.getenv("PERSISTENCE_FILE", "airdrop_bot_state.sqlite3")
+PERSISTENCE_FLUSH_INTERVAL = float(os.getenv("PERSISTENCE_FLUSH_INTERVAL", "5"))
+
+# The airdrop catalog is kept in this SQLite file in every mode, so it survives restarts
+# and changing BOT_WORKERS. With 2 or more workers, this process only receives updates and
+# hands them to the worker processes, which all share CATALOG_FILE.
+BOT_WORKERS = int(os.getenv("BOT_WORKERS", "1"))
+CATALOG_FILE = os.getenv("CATALOG_FILE", "airdrop_catalog.sqlite3")
+
 # Default SVG icon from your HTML for links without valid icons
 DEFAULT_SVG_ICON = 'data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHZpZXdCb3g9IjAgMCAyNCAyNCI+PHBhdGggZmlsbD0iIzkwYjBjOCIgZD0iTTEyLDIyQzYuNDgsMjIsMiwxNy41MiwyLDEyUzYuNDgsMiwxMiwyczEwLDQuNDgsMTAsMTBTSDE3LjUyLDIyLDEyLDIyLzBNMjQsMThjLTQuNDEsMC04LTMuNTktOC04czMuNTktOCw4LTggOCwzLjU5LDgsOFMxOS41OSwyMCwyNCwxOHoiLz48L2Vncz4='
 
-# --- 3. In-Memory Data Storage (WARNING: Data will be lost on bot restart!) ---
+# --- 3. In-Memory Data Storage ---
+# Handlers read the catalog from this list; it is loaded from CATALOG_FILE when the bot starts.
 all_airdrops_in_memory = []
-# You can pre-populate this list with some default airdrops if you wish:
+# You can pre-populate this list with some default airdrops if you wish
+# (they are copied into CATALOG_FILE the first time the bot starts with an empty catalog):
 # all_airdrops_in_memory = [
 #     {
 #         'id': '1',
@@ -62,11 +83,13 @@ if all_airdrops_in_memory:
 else:
     current_id_counter = 1
 
+# Catalog store backing the list above, opened by main() or by each worker (see section 15).
+catalog_store = None
 
 # --- 4. Conversation States for Add/Edit/Delete Operations ---
 # Used by ConversationHandler to manage multi-step user input
 TITLE, URL, ICON, DESCRIPTION, REFERRAL = range(5)
-ADMIN_LOGIN_PASS = range(5, 6)
+ADMIN_LOGIN_PASS, = range(5, 6) # Unpacked so the state is a plain int that can be persisted
 EDIT_ID_PROMPT, EDIT_PASS_PROMPT, EDIT_FIELD_SELECT, EDIT_NEW_VALUE = range(6, 10)
 DELETE_ID_PROMPT, DELETE_PASS_PROMPT, DELETE_CONFIRMATION = range(10, 13)
 
@@ -139,8 +162,79 @@ def find_link_by_id(link_id):
     for link in all_airdrops_in_memory:
         if link.get('id') == link_id:
             return link
+    if catalog_store:
+        # Not in memory yet, e.g. just added on another worker and the notification is still on its way.
+        link = catalog_store.load_link(link_id)
+        if link:
+            put_link_in_memory(link)
+        return link
     return None
 
+def next_link_id():
+    """Returns a fresh ID for a new airdrop."""
+    global current_id_counter
+    if catalog_store:
+        return catalog_store.next_id() # Shared counter so workers never hand out the same ID
+    new_id = str(current_id_counter)
+    current_id_counter += 1 # Increment for next airdrop
+    return new_id
+
+def put_link_in_memory(link):
+    """Adds a link to the in-memory list or replaces the one with the same ID."""
+    for i, existing in enumerate(all_airdrops_in_memory):
+        if existing.get('id') == link['id']:
+            all_airdrops_in_memory[i] = link
+            break
+    else:
+        all_airdrops_in_memory.append(link)
+
+def save_link(link):
+    """Adds a new link or replaces the link with the same ID."""
+    # Store first: if the write fails, memory must not show a link the store doesn't have.
+    if catalog_store:
+        catalog_store.save_link(link)
+    put_link_in_memory(link)
+
+def update_link_field(link_id, field, new_value):
+    """Sets one field of a link and returns the updated link, or None if it doesn't exist."""
+    def apply_edit(link):
+        link = dict(link)
+        link[field] = new_value
+        link['timestamp'] = int(datetime.now().timestamp() * 1000) # Update timestamp on edit
+        # Re-sanitize to apply icon logic if URL/icon changed, etc.
+        return sanitize_link_data(link, link_id)
+
+    if catalog_store:
+        # Edit the current row inside one store transaction, so a concurrent edit
+        # made on another worker is not overwritten by this worker's stale copy.
+        updated_link = catalog_store.update_link(link_id, apply_edit)
+    else:
+        link = find_link_by_id(link_id)
+        updated_link = apply_edit(link) if link else None
+    if updated_link:
+        put_link_in_memory(updated_link)
+    return updated_link
+
+def delete_link(link_id):
+    """Removes a link by its ID. Returns True if it existed."""
+    global all_airdrops_in_memory
+    # Store first: if the delete fails, the link must stay visible in memory.
+    deleted_from_store = catalog_store.delete_link(link_id) if catalog_store else False
+    initial_len = len(all_airdrops_in_memory)
+    all_airdrops_in_memory = [link for link in all_airdrops_in_memory if link.get('id') != link_id]
+    if catalog_store:
+        return deleted_from_store
+    return len(all_airdrops_in_memory) < initial_len
+
+def refresh_link_from_store(link_id):
+    """Re-reads one link from the shared store after another worker changed it."""
+    global all_airdrops_in_memory
+    link = catalog_store.load_link(link_id)
+    if link:
+        put_link_in_memory(link)
+    else:
+        all_airdrops_in_memory = [existing for existing in all_airdrops_in_memory if existing.get('id') != link_id]
+
 def format_timestamp(ms_timestamp):
     """Formats a millisecond timestamp to a human-readable string."""
     if not ms_timestamp or not isinstance(ms_timestamp, (int, float)):
@@ -159,7 +253,7 @@ async def start(update: Update, context):
         "•  /search <query> - Find airdrops by title, description, or referral code.\n"
         "•  /admin_login - (Admins only) Access management features.\n"
         "•  /admin_logout - (Admins only) Log out from admin session.\n\n"
-        "<b>⚠️ Note: This bot's data is stored in memory and will be lost on restart.</b>\n"
+        "<b>⚠️ Note: Admin logins are kept in memory and are lost on restart.</b>\n"
         "Feel free to explore!"
     )
 
@@ -354,14 +448,12 @@ async def add_airdrop_referral(update: Update, context):
     
     # Generate ID and add to in-memory list
     try:
-        global current_id_counter
-        new_id = str(current_id_counter)
-        current_id_counter += 1 # Increment for next airdrop
+        new_id = next_link_id()
 
         # Sanitize data and explicitly add the generated ID
         link_data_to_save = sanitize_link_data(context.user_data['new_airdrop'], link_id=new_id)
         
-        all_airdrops_in_memory.append(link_data_to_save)
+        save_link(link_data_to_save)
         await update.message.reply_html(f"✅ Airdrop '<b>{link_data_to_save['title']}</b>' added successfully!\n"
                                         f"<i>ID: {link_data_to_save['id']}</i>")
         logger.info(f"New airdrop added by {update.effective_user.id}: {link_data_to_save['title']} ({link_data_to_save['id']})")
@@ -465,26 +557,12 @@ async def edit_airdrop_new_value(update: Update, context):
         new_value = ''
 
     try:
-        # Find the link in the in-memory list
-        link_to_update = find_link_by_id(link_id)
-        if not link_to_update:
+        # Update the specific field on the current version of the link
+        updated_sanitized_link = update_link_field(link_id, field, new_value)
+        if not updated_sanitized_link:
             await update.message.reply_html("❌ Airdrop not found during update. It might have been deleted by someone else.")
             return ConversationHandler.END
 
-        # Update the specific field
-        link_to_update[field] = new_value
-        link_to_update['timestamp'] = int(datetime.now().timestamp() * 1000) # Update timestamp on edit
-
-        # Re-sanitize to apply icon logic if URL/icon changed, etc.
-        # This will also ensure timestamp is preserved.
-        updated_sanitized_link = sanitize_link_data(link_to_update, link_id)
-        
-        # Replace the old version of the link in the list with the updated one
-        for i, link in enumerate(all_airdrops_in_memory):
-            if link.get('id') == link_id:
-                all_airdrops_in_memory[i] = updated_sanitized_link
-                break
-
         await update.message.reply_html(f"✅ Airdrop '<b>{updated_sanitized_link.get('title', 'N/A')}</b>' successfully updated '<b>{field.replace('_', ' ').title()}</b>'.")
         logger.info(f"Airdrop {link_id} updated by {update.effective_user.id}: field '{field}' changed to '{new_value}'")
     except Exception as e:
@@ -557,11 +635,7 @@ async def delete_airdrop_confirm_callback(update: Update, context):
 
     try:
         # Remove the link from the in-memory list
-        global all_airdrops_in_memory
-        initial_len = len(all_airdrops_in_memory)
-        all_airdrops_in_memory = [link for link in all_airdrops_in_memory if link.get('id') != link_id]
-        
-        if len(all_airdrops_in_memory) < initial_len:
+        if delete_link(link_id):
             await query.edit_message_text(f"✅ Airdrop '<b>{link_title}</b>' successfully deleted.")
             logger.info(f"Airdrop {link_id} deleted by {update.effective_user.id}.")
         else:
@@ -597,13 +671,403 @@ async def error_handler(update: Update, context):
             "Please try again or use /cancel to reset."
         )
 
-# --- 14. Main Bot Setup Function ---
-def main():
-    """Starts the bot."""
-    # Create the Application and pass your bot's token.
+# --- 14. Conversation & User Data Persistence ---
+
+class SQLitePersistence(BasePersistence):
+    """
+    Stores conversation states and user_data in SQLite, one row per key.
+    Changes are only marked dirty when the Application reports them and are
+    written out as a single batched transaction of upserts/deletes, so a flush
+    costs as much as the number of changed keys, not the number of users.
+    Empty user_data and finished conversations are deleted instead of stored,
+    which keeps restore time proportional to the users that are mid-flow.
+    """
+
+    def __init__(self, filepath, update_interval=PERSISTENCE_FLUSH_INTERVAL):
+        super().__init__(
+            store_data=PersistenceInput(bot_data=False, chat_data=False, user_data=True, callback_data=False),
+            update_interval=update_interval,
+        )
+        self.filepath = filepath
+        self._conn = None
+        self._dirty = {} # (table, key) -> serialized value, or None to delete the row
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = None
+
+    def _connect(self):
+        if self._conn is None:
+            # Writes happen in a worker thread (see flush), reads during startup.
+            self._conn = sqlite3.connect(self.filepath, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS user_data (user_id INTEGER PRIMARY KEY, data TEXT NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS conversations ("
+                    "name TEXT NOT NULL, key TEXT NOT NULL, state TEXT NOT NULL, PRIMARY KEY (name, key))"
+                )
+        return self._conn
+
+    def _mark_dirty(self, table, key, value):
+        """Records a pending change and makes sure a flush is scheduled for it."""
+        self._dirty[(table, key)] = value
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        # All updates reported in the same persistence run land before this task
+        # gets to run, so they are written together in one transaction.
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_in_background())
+
+    def _write_batch(self, batch):
+        conn = self._connect()
+        with conn: # One transaction per batch
+            for (table, key), value in batch.items():
+                if table == 'user_data':
+                    if value is None:
+                        conn.execute("DELETE FROM user_data WHERE user_id = ?", (key,))
+                    else:
+                        conn.execute(
+                            "INSERT INTO user_data (user_id, data) VALUES (?, ?) "
+                            "ON CONFLICT(user_id) DO UPDATE SET data = excluded.data",
+                            (key, value),
+                        )
+                else:
+                    name, conv_key = key
+                    if value is None:
+                        conn.execute("DELETE FROM conversations WHERE name = ? AND key = ?", (name, conv_key))
+                    else:
+                        conn.execute(
+                            "INSERT INTO conversations (name, key, state) VALUES (?, ?, ?) "
+                            "ON CONFLICT(name, key) DO UPDATE SET state = excluded.state",
+                            (name, conv_key, value),
+                        )
+
+    def _load_user_data(self):
+        rows = self._connect().execute("SELECT user_id, data FROM user_data").fetchall()
+        return {user_id: json.loads(data) for user_id, data in rows}
+
+    def _load_conversations(self, name):
+        rows = self._connect().execute("SELECT key, state FROM conversations WHERE name = ?", (name,)).fetchall()
+        # Conversation keys are tuples like (chat_id, user_id); JSON turns them into lists.
+        return {tuple(json.loads(key)): json.loads(state) for key, state in rows}
+
+    async def get_user_data(self):
+        return await asyncio.to_thread(self._load_user_data)
+
+    async def get_conversations(self, name):
+        return await asyncio.to_thread(self._load_conversations, name)
+
+    async def update_user_data(self, user_id, data):
+        self._mark_dirty('user_data', user_id, json.dumps(data) if data else None)
+
+    async def drop_user_data(self, user_id):
+        self._mark_dirty('user_data', user_id, None)
+
+    async def update_conversation(self, name, key, new_state):
+        # None means the conversation is over; END is stored the same way.
+        if new_state is None or new_state == ConversationHandler.END:
+            value = None
+        else:
+            value = json.dumps(new_state)
+        self._mark_dirty('conversations', (name, json.dumps(list(key))), value)
+
+    async def _write_pending(self):
+        """Writes all pending changes. Returns False if a write failed; those changes stay pending."""
+        async with self._flush_lock:
+            while self._dirty:
+                batch, self._dirty = self._dirty, {}
+                try:
+                    await asyncio.to_thread(self._write_batch, batch)
+                except Exception as e:
+                    # Put the batch back (newer changes win), e.g. when another worker held the database lock.
+                    self._dirty = {**batch, **self._dirty}
+                    logger.error(f"Error writing {len(batch)} pending changes to {self.filepath}: {e}")
+                    return False
+        return True
+
+    async def _flush_in_background(self):
+        if not await self._write_pending():
+            logger.info(f"Retrying pending changes in {self.update_interval} seconds.")
+            asyncio.get_running_loop().call_later(self.update_interval, self._schedule_flush)
+
+    async def flush(self):
+        """
+        Writes all pending changes. Called by the Application on shutdown, when there
+        is no later flush to fall back on, so failed writes are retried right here.
+        """
+        for attempt in range(3):
+            if await self._write_pending():
+                return
+            await asyncio.sleep(1)
+        logger.error(f"Giving up: {len(self._dirty)} pending changes were not written to {self.filepath} and are lost.")
+
+    async def refresh_user_data(self, user_id, user_data):
+        pass # Each user is only handled by one process, so in-memory data is always current
+
+    # bot_data, chat_data and callback_data are not used by this bot.
+    async def get_chat_data(self):
+        return {}
+
+    async def get_bot_data(self):
+        return {}
+
+    async def get_callback_data(self):
+        return None
+
+    async def update_chat_data(self, chat_id, data):
+        pass
+
+    async def update_bot_data(self, data):
+        pass
+
+    async def update_callback_data(self, data):
+        pass
+
+    async def drop_chat_data(self, chat_id):
+        pass
+
+    async def refresh_chat_data(self, chat_id, chat_data):
+        pass
+
+    async def refresh_bot_data(self, bot_data):
+        pass
+
+# --- 15. Shared Catalog Store & Sharded Worker Mode ---
+
+class CatalogStore:
+    """
+    The airdrop catalog in a SQLite file, shared by all worker processes in sharded mode.
+    There, every write is followed by a change notification carrying the link ID; the
+    ingress process fans it out so each worker refreshes just that link in its
+    in-memory list. In single-process mode notify_queue is None.
+    """
+
+    def __init__(self, filepath, notify_queue=None):
+        self.notify_queue = notify_queue
+        # Autocommit mode; next_id() opens its own write transaction.
+        self._conn = sqlite3.connect(filepath, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS airdrops (id TEXT PRIMARY KEY, data TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('next_id', 1)")
+
+    def _notify(self, link_id):
+        if self.notify_queue is not None:
+            self.notify_queue.put(link_id)
+
+    def seed(self, links, next_id):
+        """Copies links into the store if it is still empty."""
+        self._conn.execute("BEGIN IMMEDIATE") # Several workers may try this at startup
+        try:
+            if self._conn.execute("SELECT COUNT(*) FROM airdrops").fetchone()[0] == 0:
+                self._conn.executemany(
+                    "INSERT INTO airdrops (id, data) VALUES (?, ?)", [(link['id'], json.dumps(link)) for link in links]
+                )
+                self._conn.execute("UPDATE meta SET value = MAX(value, ?) WHERE key = 'next_id'", (next_id,))
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def load_all(self):
+        return [json.loads(data) for (data,) in self._conn.execute("SELECT data FROM airdrops")]
+
+    def load_link(self, link_id):
+        row = self._conn.execute("SELECT data FROM airdrops WHERE id = ?", (link_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def next_id(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers can't read the same value.
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            (value,) = self._conn.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()
+            self._conn.execute("UPDATE meta SET value = ? WHERE key = 'next_id'", (value + 1,))
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return str(value)
+
+    def update_link(self, link_id, apply_edit):
+        """Applies apply_edit to the stored link under the write lock. Returns the new link or None."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute("SELECT data FROM airdrops WHERE id = ?", (link_id,)).fetchone()
+            if row is None:
+                self._conn.execute("ROLLBACK")
+                return None
+            link = apply_edit(json.loads(row[0]))
+            self._conn.execute("UPDATE airdrops SET data = ? WHERE id = ?", (json.dumps(link), link_id))
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._notify(link_id)
+        return link
+
+    def save_link(self, link):
+        self._conn.execute(
+            "INSERT INTO airdrops (id, data) VALUES (?, ?) ON CONFLICT(id) DO UPDATE SET data = excluded.data",
+            (link['id'], json.dumps(link)),
+        )
+        self._notify(link['id'])
+
+    def delete_link(self, link_id):
+        deleted = self._conn.execute("DELETE FROM airdrops WHERE id = ?", (link_id,)).rowcount > 0
+        if deleted:
+            self._notify(link_id)
+        return deleted
+
+def open_catalog_store(notify_queue=None):
+    """Opens CATALOG_FILE and loads it into the in-memory list the handlers read."""
+    global catalog_store, all_airdrops_in_memory
+    catalog_store = CatalogStore(CATALOG_FILE, notify_queue)
+    if all_airdrops_in_memory: # Pre-populated in section 3
+        catalog_store.seed(all_airdrops_in_memory, current_id_counter)
+    all_airdrops_in_memory = catalog_store.load_all()
+
+def shard_for_update(update, num_workers):
+    """
+    Picks the worker for an update. Sharding on the user keeps a user's conversations,
+    user_data and admin login on one worker; in private chats this is the chat id.
+    """
+    if update.effective_user:
+        key = update.effective_user.id
+    elif update.effective_chat:
+        key = update.effective_chat.id
+    else:
+        key = 0
+    return key % num_workers
+
+def fan_out_catalog_changes(notify_queue, inboxes, inboxes_lock):
+    """Forwards catalog change notifications from any worker to every worker."""
+    while True:
+        link_id = notify_queue.get()
+        if link_id is None:
+            return
+        # The lock keeps a worker restart from swapping out an inbox mid-loop.
+        with inboxes_lock:
+            for i, inbox in enumerate(inboxes):
+                try:
+                    inbox.put(('catalog', link_id))
+                except Exception as e:
+                    # Keep notifying the other workers; a dead thread here would stop all notifications.
+                    logger.error(f"Could not notify worker {i} about airdrop {link_id}: {e}")
+
+def next_inbox_message(inbox, worker_index):
+    """
+    Blocks until the next inbox message. Returns None (the shutdown sentinel) if the
+    ingress process died without sending one, so orphaned workers still stop and flush.
+    """
+    parent = multiprocessing.parent_process()
+    while True:
+        try:
+            return inbox.get(timeout=1)
+        except queue.Empty:
+            if parent is not None and not parent.is_alive():
+                logger.warning(f"Worker {worker_index}: ingress process is gone, shutting down.")
+                return None
+
+async def run_worker_async(worker_index, inbox, notify_queue):
+    open_catalog_store(notify_queue)
+
+    # Workers don't poll Telegram themselves; updates arrive through the inbox.
+    persistence = SQLitePersistence(PERSISTENCE_FILE)
+    application = Application.builder().token(TELEGRAM_BOT_TOKEN).updater(None).persistence(persistence).build()
+    register_handlers(application)
+
+    async with application:
+        await application.start()
+        logger.info(f"Worker {worker_index} started with {len(all_airdrops_in_memory)} airdrops.")
+        while True:
+            message = await asyncio.to_thread(next_inbox_message, inbox, worker_index)
+            if message is None: # Sent by the ingress process on shutdown
+                break
+            kind, payload = message
+            try:
+                if kind == 'update':
+                    await application.update_queue.put(Update.de_json(payload, application.bot))
+                elif kind == 'catalog':
+                    refresh_link_from_store(payload)
+            except Exception as e:
+                # One bad message must not take the whole shard down.
+                logger.error(f"Worker {worker_index} failed to handle {kind} message: {e}")
+        await application.stop()
+
+def run_worker(worker_index, inbox, notify_queue):
+    """Entry point of a worker process."""
+    # Ctrl-C and process managers (e.g. systemd) signal the whole process group; ignore that here
+    # and let the ingress process's shutdown sentinel stop the worker so persistence gets flushed.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    try:
+        asyncio.run(run_worker_async(worker_index, inbox, notify_queue))
+    except Exception:
+        logger.exception(f"Worker {worker_index} crashed.")
+        raise
+
+# A worker that dies sooner than this after being (re)started is treated as a crash loop
+# (e.g. bad token or no network during startup) and stops the bot instead of restarting.
+WORKER_MIN_UPTIME = 30
+
+def run_sharded(num_workers):
+    """Receives updates in this process and dispatches them to num_workers worker processes."""
+    inboxes = [multiprocessing.Queue() for _ in range(num_workers)]
+    notify_queue = multiprocessing.Queue()
+    inboxes_lock = threading.Lock() # Shared with the fan-out thread
+    workers = [None] * num_workers
+    started_at = [0.0] * num_workers
+
+    def start_worker(i):
+        if workers[i] is not None:
+            # A worker killed mid-read can leave its queue's read lock held, so the
+            # replacement gets a fresh inbox. Updates still queued for the dead one are dropped.
+            with inboxes_lock:
+                old_inbox, inboxes[i] = inboxes[i], multiprocessing.Queue()
+            old_inbox.cancel_join_thread()
+            old_inbox.close()
+        workers[i] = multiprocessing.Process(target=run_worker, args=(i, inboxes[i], notify_queue), name=f"worker-{i}")
+        workers[i].start()
+        started_at[i] = time.monotonic()
+
+    for i in range(num_workers):
+        start_worker(i)
+    fan_out_thread = threading.Thread(target=fan_out_catalog_changes, args=(notify_queue, inboxes, inboxes_lock), daemon=True)
+    fan_out_thread.start()
+
+    async def dispatch_update(update: Update, context):
+        shard = shard_for_update(update, num_workers)
+        worker = workers[shard]
+        if not worker.is_alive():
+            if time.monotonic() - started_at[shard] < WORKER_MIN_UPTIME:
+                logger.critical(f"Worker {shard} died right after starting (exit code {worker.exitcode}). Stopping the bot.")
+                context.application.stop_running()
+                return
+            logger.error(f"Worker {shard} died (exit code {worker.exitcode}). Restarting it.")
+            start_worker(shard)
+        inboxes[shard].put(('update', update.to_dict()))
+
     application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    application.add_handler(TypeHandler(Update, dispatch_update))
+
+    logger.info(f"Bot is starting polling with {num_workers} workers...")
+    application.run_polling(allowed_updates=Update.ALL_TYPES)
+
+    for inbox in inboxes:
+        inbox.put(None)
+    for worker in workers:
+        worker.join()
+    notify_queue.put(None)
+    fan_out_thread.join()
 
-    # Register Handlers:
+# --- 16. Main Bot Setup Function ---
+def register_handlers(application):
+    """Registers all command, conversation and callback handlers on the application."""
     # Basic Commands
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("list", list_airdrops))
@@ -621,7 +1085,9 @@ def main():
             ADMIN_LOGIN_PASS: [MessageHandler(filters.TEXT & ~filters.COMMAND, admin_login_verify)],
         },
         fallbacks=[CommandHandler("cancel", cancel_conversation)],
-        allow_reentry=True # Allows users to restart the conversation
+        allow_reentry=True, # Allows users to restart the conversation
+        name="admin_login",
+        persistent=True # Survives bot restarts via SQLitePersistence
     )
     application.add_handler(admin_login_conv_handler)
 
@@ -636,7 +1102,9 @@ def main():
             REFERRAL: [MessageHandler(filters.TEXT & ~filters.COMMAND, add_airdrop_referral)],
         },
         fallbacks=[CommandHandler("cancel", cancel_conversation)],
-        allow_reentry=True
+        allow_reentry=True,
+        name="add_airdrop",
+        persistent=True
     )
     application.add_handler(add_airdrop_conv_handler)
     
@@ -655,7 +1123,9 @@ def main():
             EDIT_NEW_VALUE: [MessageHandler(filters.TEXT & ~filters.COMMAND, edit_airdrop_new_value)],
         },
         fallbacks=[CommandHandler("cancel", cancel_conversation)],
-        allow_reentry=True
+        allow_reentry=True,
+        name="edit_airdrop",
+        persistent=True
     )
     application.add_handler(edit_airdrop_conv_handler)
 
@@ -668,7 +1138,9 @@ def main():
         },
         # Confirmation is handled by a separate CallbackQueryHandler
         fallbacks=[CommandHandler("cancel", cancel_conversation)],
-        allow_reentry=True
+        allow_reentry=True,
+        name="delete_airdrop",
+        persistent=True
     )
     application.add_handler(delete_airdrop_conv_handler)
 
@@ -679,6 +1151,21 @@ def main():
     # Register global error handler
     application.add_error_handler(error_handler)
 
+def main():
+    """Starts the bot."""
+    if BOT_WORKERS > 1:
+        run_sharded(BOT_WORKERS)
+        return
+
+    open_catalog_store()
+    logger.info(f"Loaded {len(all_airdrops_in_memory)} airdrops from {CATALOG_FILE}.")
+
+    # Create the Application and pass your bot's token.
+    # Conversation states and user_data are restored from PERSISTENCE_FILE on startup.
+    persistence = SQLitePersistence(PERSISTENCE_FILE)
+    application = Application.builder().token(TELEGRAM_BOT_TOKEN).persistence(persistence).build()
+    register_handlers(application)
+
     logger.info("Bot is starting polling...")
     # Run the bot until the user presses Ctrl-C
     application.run_polling(allowed_updates=Update.ALL_TYPES)
@@ -0,0 +1,151 @@
+"""
+Load test for the sharded worker mode.
+
+Pushes a stream of /search updates over a large catalog through the bot and compares
+single-process mode with the ingress + 1 worker and ingress + N workers setups.
+Telegram is replaced by a fake HTTP layer, so no token or network access is needed.
+
+Usage: python load_test.py [--updates 3000] [--workers 4] [--airdrops 20000] [--users 500]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+# The bot reads its file locations at import time. Worker processes started with
+# spawn/forkserver re-import this module; they inherit the environment and so reuse
+# the parent's files instead of creating a new, empty temp dir.
+if "AIRDROP_LOAD_TEST_DIR" not in os.environ:
+    os.environ["AIRDROP_LOAD_TEST_DIR"] = tempfile.mkdtemp(prefix="airdrop_load_test_")
+_tmpdir = os.environ["AIRDROP_LOAD_TEST_DIR"]
+os.environ["CATALOG_FILE"] = os.path.join(_tmpdir, "catalog.sqlite3")
+os.environ["PERSISTENCE_FILE"] = os.path.join(_tmpdir, "state.sqlite3")
+
+from telegram import Update
+from telegram.ext import Application
+from telegram.request import HTTPXRequest
+
+import bot_no_Airdrops as bot
+
+BOT_USER = {'id': 1, 'is_bot': True, 'first_name': 'LoadTestBot', 'username': 'load_test_bot'}
+
+
+async def fake_do_request(self, url, method, request_data=None, **kwargs):
+    """Answers every Bot API call locally: getMe returns the bot, everything else a message."""
+    if url.endswith('/getMe'):
+        result = BOT_USER
+    else:
+        result = {'message_id': 1, 'date': int(time.time()), 'chat': {'id': 1, 'type': 'private'}, 'text': ''}
+    return 200, json.dumps({'ok': True, 'result': result}).encode()
+
+
+# Applied at import time so worker processes get the fake HTTP layer under any start method.
+HTTPXRequest.do_request = fake_do_request
+bot.logger.setLevel('WARNING')
+bot.logging.getLogger('telegram').setLevel('WARNING')
+
+
+def seed_catalog(num_airdrops):
+    """Fills the shared catalog file and returns the same links for single-process mode."""
+    links = [
+        bot.sanitize_link_data({
+            'title': f"Airdrop {i} token-{i % 997}",
+            'url': f"https://airdrop{i}.example.com",
+            'description': f"Test airdrop number {i}",
+            'referral': f"REF{i}",
+        }, link_id=str(i))
+        for i in range(1, num_airdrops + 1)
+    ]
+    bot.CatalogStore(bot.CATALOG_FILE, None) # Creates the schema
+    conn = sqlite3.connect(bot.CATALOG_FILE)
+    with conn:
+        conn.executemany("INSERT INTO airdrops (id, data) VALUES (?, ?)", [(link['id'], json.dumps(link)) for link in links])
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'next_id'", (num_airdrops + 1,))
+    conn.close()
+    return links
+
+
+def make_updates(num_updates, num_users):
+    updates = []
+    for i in range(num_updates):
+        user_id = 1000 + i % num_users
+        text = f"/search token-{i % 997}"
+        updates.append({
+            'update_id': i + 1,
+            'message': {
+                'message_id': i + 1,
+                'date': int(time.time()),
+                'chat': {'id': user_id, 'type': 'private'},
+                'from': {'id': user_id, 'is_bot': False, 'first_name': f"User{user_id}"},
+                'text': text,
+                'entities': [{'type': 'bot_command', 'offset': 0, 'length': len('/search')}],
+            },
+        })
+    return updates
+
+
+def run_single_process(updates, links):
+    bot.all_airdrops_in_memory = links
+    application = Application.builder().token(bot.TELEGRAM_BOT_TOKEN).persistence(
+        bot.SQLitePersistence(bot.PERSISTENCE_FILE)
+    ).build()
+    bot.register_handlers(application)
+
+    async def feed():
+        async with application:
+            start = time.perf_counter()
+            for data in updates:
+                await application.process_update(Update.de_json(data, application.bot))
+            return time.perf_counter() - start
+
+    return asyncio.run(feed())
+
+
+def run_sharded(updates, num_workers, warmup):
+    timer = {}
+
+    def fake_run_polling(self, **kwargs):
+        async def feed():
+            async with self:
+                await asyncio.sleep(warmup) # Let the workers load the catalog
+                timer['start'] = time.perf_counter()
+                for data in updates:
+                    await self.process_update(Update.de_json(data, self.bot))
+        asyncio.run(feed())
+
+    original_run_polling = Application.run_polling
+    Application.run_polling = fake_run_polling
+    try:
+        bot.run_sharded(num_workers) # Returns once every worker has drained its inbox and exited
+    finally:
+        Application.run_polling = original_run_polling
+    return time.perf_counter() - timer['start']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--updates', type=int, default=3000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--airdrops', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--warmup', type=float, default=3.0, help="Seconds to wait for workers to start")
+    args = parser.parse_args()
+
+    links = seed_catalog(args.airdrops)
+    updates = make_updates(args.updates, args.users)
+
+    results = [('single process', run_single_process(updates, links))]
+    for num_workers in sorted({1, args.workers}):
+        results.append((f"ingress + {num_workers} worker(s)", run_sharded(updates, num_workers, args.warmup)))
+
+    print(f"{args.updates} updates, {args.airdrops} airdrops, {args.users} users, {os.cpu_count()} CPUs")
+    baseline = results[0][1]
+    for label, seconds in results:
+        print(f"{label:<26} {seconds:8.2f}s {args.updates / seconds:10.1f} updates/s  x{baseline / seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()